@@ -1,282 +1,421 @@
 # proteinindex.py (or app.py)
 
+from functools import partial
+
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
-from streamlit.components.v1 import html # Import html component for embedding
-
-# --- Sample Data (from your original dashboard) ---
-data = pd.DataFrame({
-    'Food': ['Lentils', 'Chicken', 'Soy', 'Milk', 'Egg', 'Fish', 'Beef', 'Quinoa'],
-    'Protein Index': [78, 85, 92, 50, 88, 82, 75, 90],
-    'Cost per gram protein': [0.4, 0.7, 0.5, 0.6, 0.45, 0.65, 0.9, 0.55],
-    'Region': ['Asia', 'US', 'Asia', 'Europe', 'US', 'Europe', 'US', 'Asia']
-})
-
-# --- Directly Defined DataFrames from your pasted snippets ---
-
-# Table 1: Indicators
-df_indicators = pd.DataFrame({
-    'Sno.': [1, 2, 3],
-    'Pillar': ['Protein Intake', 'Protein Availability', 'Protein Accessibility'],
-    'Indicator': [
-        'Average protein consumption per capita per day',
-        'Availability of protein sources (animal, plant, etc.)',
-        'Economic and geographic access to protein-rich foods'
-    ],
-    'Sub-Indicators / Metrics': [
-        'Daily intake (g/day/person), % of population...',
-        'National supply, Food loss...',
-        '% households with access...'
-    ]
-})
-
-# Table 2: Data Sources
-df_data_sources = pd.DataFrame({
-    'Sno.': [1, 2, 3],
-    'Tool': ['Global Dietary Database (GDD)', 'FAO (FAOSTAT)', 'WFP DataViz'],
-    'Description': [
-        'Dietary intake data by country',
-        'Food and nutrition data',
-        'Food security maps & dashboards'
-    ],
-    'Organization': ['USSEC', 'Right to Protein', 'GHI'],
-    'Focus Area': ['Soy advocacy', 'Education', 'Undernutrition'],
-    'Relevance to PNS': ['Lead agency', 'Public messaging', 'Global hunger metrics']
-})
-
-# Table 3: US Soy Export (parsing based on likely intended structure)
-df_us_soy_export = pd.DataFrame({
-    'Country': ['China', 'EU27+UK'],
-    '2016': [14203, 1899],
-    '2017': [12224, 1637],
-    '2018': [31198, 3078],
-    '2019': [0, 1953], # Assuming '0' for China based on visual parsing
-    '2020': [51415, 1940], # Assuming '51415' for China based on visual parsing
-    '2019-20 % Change': [90.77, -0.01],
-    'Market Type': ['Established/Mature Markets', 'Emerging Growth Markets']
-})
-
-# Table 4: Global Data
-df_global_data = pd.DataFrame({
-    'Country Name': ['Aruba', 'Africa Eastern and Southern'],
-    'Population': [107359, 750503764],
-    'GDP per Capita (USD)': [33984.79, 1659.52],
-    'Final Consumption Expenditure (USD)': [2614191997.79, 1026808895145.70]
-})
-
-# Table 5: Regions Countries
-df_regions_countries = pd.DataFrame({
-    'Region': ['South Asia', 'South Asia'],
-    'Country': ['Afghanistan', 'Bangladesh'],
-    'Population': [41454761, 171466990],
-    'GDP per Capita': [415.71, 2551.02],
-    'Household Consumption (USD)': [20433530399.95, 324739267255.56]
-})
-
-# Table 6: Organogram
-df_organogram = pd.DataFrame({
-    'Name': ['Joydeep Dutt', 'Rupesh Mukherjee', 'Jhelum Chowdhury'],
-    'Job Title': ['Program Director', 'Practice Lead', 'Senior Project Lead']
-})
-
-# Dictionary to hold all dynamically added DataFrames
-dynamic_dfs = {
-    "Indicators Table": df_indicators,
-    "Data Sources Table": df_data_sources,
-    "US Soy Export Table": df_us_soy_export,
-    "Global Data Table": df_global_data,
-    "Regions Countries Table": df_regions_countries,
-    "Organogram Table": df_organogram,
-}
+import pyarrow as pa
+import pyarrow.csv as pacsv
 
 # --- Streamlit Page Configuration ---
+# Configured first so the page chrome reaches the browser before any data loads.
 st.set_page_config(layout="wide", page_title="Protein & Food Security Dashboard")
 
 # --- Dashboard Title ---
 st.title("Protein Index & Global Food Security Dashboard")
 st.markdown("A comprehensive dashboard for protein analysis, global food security visualizations, and detailed data insights.")
 
-# --- Define the tabs ---
-tab_names = ["Protein Dashboard", "Global Maps"] + list(dynamic_dfs.keys())
-tabs = st.tabs(tab_names)
+# --- Sample Data (from your original dashboard) ---
+# Cached so the DataFrame is built once instead of on every script rerun.
+@st.cache_data(show_spinner=False)
+def get_sample_data():
+    # Columns are built with their final dtypes, so pandas skips type inference:
+    # the index fits int8, and the low-cardinality labels are stored as integer
+    # codes, not Python strings. Cost stays float64 so the averages shown in
+    # Key Insights round exactly as before.
+    return pd.DataFrame({
+        'Food': pd.Categorical(['Lentils', 'Chicken', 'Soy', 'Milk', 'Egg', 'Fish', 'Beef', 'Quinoa']),
+        'Protein Index': np.array([78, 85, 92, 50, 88, 82, 75, 90], dtype=np.int8),
+        'Cost per gram protein': np.array([0.4, 0.7, 0.5, 0.6, 0.45, 0.65, 0.9, 0.55], dtype=np.float64),
+        'Region': pd.Categorical(['Asia', 'US', 'Asia', 'Europe', 'US', 'Europe', 'US', 'Asia'])
+    })
+
+with st.spinner("Loading data..."):
+    data = get_sample_data()
+# Read straight from the categorical dtype; no scan over the column
+region_opts = tuple(data['Region'].cat.categories)
+# Column positions for scalar iat lookups in the Key Insights section
+food_col, pi_col, cost_col = (
+    data.columns.get_loc(c) for c in ('Food', 'Protein Index', 'Cost per gram protein')
+)
+
+# Raw numpy views of the filter columns, so the filter step can build its mask
+# without going through pandas' per-Series operator dispatch.
+# Region is kept as its integer category codes plus the categories lookup.
+@st.cache_data(show_spinner=False)
+def get_filter_arrays():
+    df = get_sample_data()
+    return (
+        df['Region'].cat.categories,
+        df['Region'].cat.codes.to_numpy(),
+        df['Protein Index'].to_numpy(),
+        df['Cost per gram protein'].to_numpy(),
+    )
+
+# Filter results are memoized per widget state, so reruns that leave the
+# filters untouched (or return to an earlier state) skip the mask entirely.
+@st.cache_data(show_spinner=False, max_entries=64)
+def compute_filtered(regions, min_index, max_index, max_cost):
+    region_cats, region_codes, pi_arr, cost_arr = get_filter_arrays()
+    mask = (pi_arr >= min_index) & (pi_arr <= max_index) & (cost_arr <= max_cost)
+    # With every region selected (the default) the membership test is a no-op
+    if len(regions) != len(region_opts):
+        mask &= np.isin(region_codes, region_cats.get_indexer(regions))
+    return get_sample_data().iloc[mask]
+
+# Key Insights text for a filter state: one 2-column array serves both means and
+# the argmin/argmax lookups, and the whole block is cached as a single markdown
+# string so a rerun sends one element instead of five.
+@st.cache_data(show_spinner=False, max_entries=64)
+def compute_insights(regions, min_index, max_index, max_cost):
+    filtered = compute_filtered(regions, min_index, max_index, max_cost)
+    stats_arr = filtered[['Protein Index', 'Cost per gram protein']].to_numpy()
+    pi_mean, cost_mean = stats_arr.mean(axis=0)
+    cheapest = stats_arr[:, 1].argmin()
+    best_index = stats_arr[:, 0].argmax()
+
+    lines = [
+        f"**{len(filtered)}** out of **{len(data)}** protein sources are currently displayed based on your filters.",
+        f"**Average Protein Index** of filtered foods: **{pi_mean:.2f}**",
+        f"**Average Cost per gram protein** of filtered foods: **${cost_mean:.2f}**",
+    ]
+    food, pi, cost = (filtered.iat[cheapest, c] for c in (food_col, pi_col, cost_col))
+    lines.append(f"The most **cost-effective** protein source in the filtered list is **{food}** (Protein Index: {pi}, Cost: ${cost:.2f}/g protein).")
+    food, pi, cost = (filtered.iat[best_index, c] for c in (food_col, pi_col, cost_col))
+    lines.append(f"The protein source with the **highest Protein Index** is **{food}** (Protein Index: {pi}, Cost: ${cost:.2f}/g protein).")
+    return "\n\n".join(lines)
+
+# Plotly figures are shared, read-only objects, so they live in the resource cache.
+# Bounded, since every distinct filter state would otherwise keep a figure alive.
+@st.cache_resource(show_spinner=False, max_entries=64)
+def build_scatter(regions, min_index, max_index, max_cost):
+    # Imported here so sessions that never open the Protein Dashboard skip
+    # loading Plotly Express at startup.
+    import plotly.express as px
+
+    fig = px.scatter(
+        compute_filtered(regions, min_index, max_index, max_cost),
+        x="Cost per gram protein",
+        y="Protein Index",
+        color="Food",
+        size="Protein Index",
+        hover_name="Food",
+        title="Protein Index vs. Cost per Gram Protein by Food Source",
+        labels={
+            "Cost per gram protein": "Cost per Gram of Protein (USD)",
+            "Protein Index": "Protein Index (Efficiency)"
+        },
+        template="plotly_white",
+        # Plotly switches to WebGL (scattergl) by itself past 1000 points and
+        # keeps SVG below that, where it draws faster than a GL context.
+        render_mode="auto"
+    )
+    fig.update_layout(
+        xaxis_title_standoff=10,
+        yaxis_title_standoff=10,
+        legend_title="Food Source",
+        hovermode="closest"
+    )
+    return fig
+
+# Arrow table for st.dataframe, which would otherwise redo the pandas -> Arrow
+# conversion on every rerun. Used for the static tables; the filtered table has
+# its own cache below, keyed on the filter state.
+@st.cache_data(show_spinner=False)
+def to_arrow(df):
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+# The filtered table's Arrow form, keyed like compute_filtered so a rerun hashes
+# four scalars rather than the whole filtered frame.
+@st.cache_data(show_spinner=False, max_entries=64)
+def filtered_arrow(regions, min_index, max_index, max_cost):
+    return pa.Table.from_pandas(compute_filtered(regions, min_index, max_index, max_cost), preserve_index=False)
+
+# The filtered table's CSV bytes for the download button, written by Arrow's CSV
+# writer from the cached Arrow table and keyed on the filter state, so a rerun
+# hashes four scalars rather than re-serializing the filtered frame.
+@st.cache_data(show_spinner=False, max_entries=64)
+def filtered_csv_bytes(regions, min_index, max_index, max_cost):
+    buf = pa.BufferOutputStream()
+    pacsv.write_csv(filtered_arrow(regions, min_index, max_index, max_cost), buf)
+    return buf.getvalue().to_pybytes()
 
-# --- Content for Each Tab ---
-for i, tab in enumerate(tabs):
-    if tab_names[i] == "Protein Dashboard":
-        with tab:
-            st.header("Protein Index & Affordability Analysis")
-            st.markdown("A prototype dashboard to identify cost-effective protein-rich foods based on expert research.")
-
-            # --- Sidebar for Filters ---
-            st.sidebar.header("Protein Source Filter Options")
-            st.sidebar.markdown("Adjust the sliders and selections below to find the best protein sources.")
-
-            # Filter 1: Select Region
-            regions = st.sidebar.multiselect(
-                "Select Region(s)",
-                options=data['Region'].unique(),
-                default=data['Region'].unique(),
-                help="Filter foods available in specific regions."
+# --- Directly Defined DataFrames from your pasted snippets ---
+# Built once and cached; reruns get the memoized tables instead of re-running
+# the DataFrame constructors. Integer columns are created directly as int8/int32
+# (every count here fits), which also spares pandas the dtype inference pass.
+@st.cache_data(show_spinner=False)
+def get_static_tables():
+    # Table 1: Indicators
+    df_indicators = pd.DataFrame({
+        'Sno.': np.array([1, 2, 3], dtype=np.int8),
+        'Pillar': ['Protein Intake', 'Protein Availability', 'Protein Accessibility'],
+        'Indicator': [
+            'Average protein consumption per capita per day',
+            'Availability of protein sources (animal, plant, etc.)',
+            'Economic and geographic access to protein-rich foods'
+        ],
+        'Sub-Indicators / Metrics': [
+            'Daily intake (g/day/person), % of population...',
+            'National supply, Food loss...',
+            '% households with access...'
+        ]
+    })
+
+    # Table 2: Data Sources
+    df_data_sources = pd.DataFrame({
+        'Sno.': np.array([1, 2, 3], dtype=np.int8),
+        'Tool': ['Global Dietary Database (GDD)', 'FAO (FAOSTAT)', 'WFP DataViz'],
+        'Description': [
+            'Dietary intake data by country',
+            'Food and nutrition data',
+            'Food security maps & dashboards'
+        ],
+        'Organization': ['USSEC', 'Right to Protein', 'GHI'],
+        'Focus Area': ['Soy advocacy', 'Education', 'Undernutrition'],
+        'Relevance to PNS': ['Lead agency', 'Public messaging', 'Global hunger metrics']
+    })
+
+    # Table 3: US Soy Export (parsing based on likely intended structure)
+    df_us_soy_export = pd.DataFrame({
+        'Country': ['China', 'EU27+UK'],
+        '2016': np.array([14203, 1899], dtype=np.int32),
+        '2017': np.array([12224, 1637], dtype=np.int32),
+        '2018': np.array([31198, 3078], dtype=np.int32),
+        '2019': np.array([0, 1953], dtype=np.int32), # Assuming '0' for China based on visual parsing
+        '2020': np.array([51415, 1940], dtype=np.int32), # Assuming '51415' for China based on visual parsing
+        '2019-20 % Change': [90.77, -0.01],
+        'Market Type': ['Established/Mature Markets', 'Emerging Growth Markets']
+    })
+
+    # Table 4: Global Data
+    df_global_data = pd.DataFrame({
+        'Country Name': ['Aruba', 'Africa Eastern and Southern'],
+        'Population': np.array([107359, 750503764], dtype=np.int32),
+        'GDP per Capita (USD)': [33984.79, 1659.52],
+        'Final Consumption Expenditure (USD)': [2614191997.79, 1026808895145.70]
+    })
+
+    # Table 5: Regions Countries
+    df_regions_countries = pd.DataFrame({
+        'Region': ['South Asia', 'South Asia'],
+        'Country': ['Afghanistan', 'Bangladesh'],
+        'Population': np.array([41454761, 171466990], dtype=np.int32),
+        'GDP per Capita': [415.71, 2551.02],
+        'Household Consumption (USD)': [20433530399.95, 324739267255.56]
+    })
+
+    # Table 6: Organogram
+    df_organogram = pd.DataFrame({
+        'Name': ['Joydeep Dutt', 'Rupesh Mukherjee', 'Jhelum Chowdhury'],
+        'Job Title': ['Program Director', 'Practice Lead', 'Senior Project Lead']
+    })
+
+    # Dictionary to hold all dynamically added DataFrames
+    return {
+        "Indicators Table": df_indicators,
+        "Data Sources Table": df_data_sources,
+        "US Soy Export Table": df_us_soy_export,
+        "Global Data Table": df_global_data,
+        "Regions Countries Table": df_regions_countries,
+        "Organogram Table": df_organogram,
+    }
+
+dynamic_dfs = get_static_tables()
+
+# The static tables never change, so their CSV bytes are serialized once per
+# process and shared, with no per-call DataFrame hashing. pandas writes them so
+# the large USD columns stay plain decimals (Arrow's writer uses exponents).
+@st.cache_resource(show_spinner=False)
+def get_static_csv_bytes():
+    return {name: df.to_csv(index=False).encode('utf-8') for name, df in get_static_tables().items()}
+
+# Likewise their Arrow tables, so st.dataframe skips the pandas -> Arrow step.
+@st.cache_resource(show_spinner=False)
+def get_static_arrow_tables():
+    return {name: to_arrow(df) for name, df in get_static_tables().items()}
+
+# --- Static Maps ---
+# (title, Datawrapper chart id, iframe height) for the Global Maps tab
+MAPS = [
+    ("Global Hunger Index Map", "8t7Fk", 800),
+    ("GFSI Data", "CKF5t", 800),
+    ("Reasons for Food Insecurity", "w7M9B", 800),
+]
+map_titles = [title for title, _, _ in MAPS]
+map_meta = {title: (dw_id, height) for title, dw_id, height in MAPS}
+
+# --- Tab Renderers ---
+# Fragments: a widget change inside one of these reruns only that function
+# rather than the whole script.
+@st.fragment
+def render_protein_dashboard(tab):
+    # --- Sidebar for Filters ---
+    st.sidebar.header("Protein Source Filter Options")
+    st.sidebar.markdown("Adjust the sliders and selections below to find the best protein sources.")
+
+    # Filter 1: Select Region
+    regions = st.sidebar.multiselect(
+        "Select Region(s)",
+        options=region_opts,
+        default=region_opts,
+        help="Filter foods available in specific regions."
+    )
+
+    # Filter 2: Protein Index Range
+    min_index, max_index = st.sidebar.slider(
+        "Protein Index Range",
+        min_value=0,
+        max_value=100,
+        value=(70, 100),
+        step=5,
+        help="Filter foods by their protein content efficiency (higher is better)."
+    )
+
+    # Filter 3: Max Cost per gram protein
+    max_cost = st.sidebar.slider(
+        "Max Cost per gram protein (USD)",
+        min_value=0.1,
+        max_value=1.0,
+        value=0.7,
+        step=0.05,
+        help="Filter foods based on their affordability (lower cost is better)."
+    )
+
+    filter_key = (tuple(regions), min_index, max_index, max_cost)
+
+    # The filters above always render so they keep their values on other tabs;
+    # the results are only computed while this tab is the one being viewed.
+    if not tab.open:
+        return
+
+    with tab:
+        st.header("Protein Index & Affordability Analysis")
+        st.markdown("A prototype dashboard to identify cost-effective protein-rich foods based on expert research.")
+
+        # --- Apply Filters to Data ---
+        filtered_data = compute_filtered(*filter_key)
+        n_filtered = len(filtered_data)
+        is_empty = n_filtered == 0
+
+        # --- Display Filtered Data ---
+        st.subheader("Filtered Protein Sources Table")
+        if is_empty:
+            st.warning("No protein sources match the selected filters. Please adjust your selections.")
+        else:
+            st.dataframe(filtered_arrow(*filter_key), width="stretch", height=250, hide_index=True)
+            st.download_button(
+                label="Download Filtered Data as CSV",
+                data=filtered_csv_bytes(*filter_key),
+                file_name='filtered_protein_sources.csv',
+                mime='text/csv',
+                help="Download the currently displayed data table."
             )
 
-            # Filter 2: Protein Index Range
-            min_index, max_index = st.sidebar.slider(
-                "Protein Index Range",
-                min_value=0,
-                max_value=100,
-                value=(70, 100),
-                step=5,
-                help="Filter foods by their protein content efficiency (higher is better)."
+        # --- Create and Display Scatter Plot ---
+        st.subheader("Protein Index vs. Cost per gram protein")
+        st.markdown("This chart visualizes the relationship between protein efficiency and cost. Look for items in the top-left quadrant (high protein index, low cost).")
+
+        if is_empty:
+            st.info("No data to display in the chart. Adjust filters to see results.")
+        else:
+            fig = build_scatter(*filter_key)
+            # No mode bar or scroll-zoom handlers: the chart only needs hover
+            st.plotly_chart(
+                fig,
+                width="stretch",
+                config={'displayModeBar': False, 'responsive': True, 'scrollZoom': False}
             )
 
-            # Filter 3: Max Cost per gram protein
-            max_cost = st.sidebar.slider(
-                "Max Cost per gram protein (USD)",
-                min_value=0.1,
-                max_value=1.0,
-                value=0.7,
-                step=0.05,
-                help="Filter foods based on their affordability (lower cost is better)."
-            )
+        # --- Datawrapper Embed for Protein Dashboard ---
+        st.subheader("Additional Protein Data Visualization")
+        st.iframe("https://datawrapper.dwcdn.net/vYiZd/", height=580) # Adjust height as needed for proper display
+        # --- END ADDITION ---
+
+        # --- Dashboard Insights and Summary ---
+        # Collapsed by default; the reductions below only run once it is opened.
+        # Streamlit drops the expander's state while this tab is hidden, so its
+        # open flag is mirrored into a plain session key and restored on return.
+        insights = st.expander(
+            "Key Insights",
+            expanded=st.session_state.get("insights_open", False),
+            key="insights_expander",
+            on_change="rerun"
+        )
+        st.session_state["insights_open"] = insights.open
+        if insights.open:
+            with insights:
+                if is_empty:
+                    st.info("No insights available as no data matches the current filters.")
+                else:
+                    st.markdown(compute_insights(*filter_key))
+
+@st.fragment
+def render_global_maps(tab):
+    if not tab.open:
+        return
+
+    with tab:
+        st.header("Global Food Security Visualizations")
+        st.markdown("Choose a map below to view different aspects of global food security and relevant initiatives.")
+
+        # Use st.radio for single selection of maps. The radio only exists while
+        # this tab is open, so the choice is kept in a plain session key and
+        # passed back through index= when the tab is reopened.
+        selected_map_title = st.radio(
+            "Select a Map to Display:",
+            options=map_titles,
+            index=map_titles.index(st.session_state.get("map_choice", map_titles[0])), # Defaults to the first map (Global Hunger Index Map)
+            key="map_selector"
+        )
+        st.session_state["map_choice"] = selected_map_title
+
+        # Display the selected map
+        if selected_map_title:
+            st.markdown(f"#### {selected_map_title}")
+            dw_id, display_height = map_meta[selected_map_title]
+            st.iframe(f"https://datawrapper.dwcdn.net/{dw_id}/", height=display_height)
+            st.markdown("---")
+        else:
+            st.info("Please select a map to display.")
+
+def render_data_table(tab, name):
+    if not tab.open:
+        return
+
+    with tab:
+        st.header(f"Data: '{name}'")
+        table = get_static_arrow_tables()[name]
+        # A handful of rows doesn't need the interactive grid; st.table sends
+        # them as a plain static table with no client-side grid to start up.
+        if table.num_rows <= 10:
+            st.table(table, hide_index=True)
+        else:
+            st.dataframe(table, width="stretch", hide_index=True)
+        st.download_button(
+            label=f"Download {name} as CSV",
+            data=get_static_csv_bytes()[name],
+            file_name=f'{name.lower().replace(" ", "_")}.csv',
+            mime='text/csv',
+            help=f"Download the data from the '{name}' tab."
+        )
 
-            # --- Apply Filters to Data ---
-            filtered_data = data[
-                (data['Region'].isin(regions)) &
-                (data['Protein Index'].between(min_index, max_index)) &
-                (data['Cost per gram protein'] <= max_cost)
-            ]
-
-            # --- Display Filtered Data ---
-            st.subheader("Filtered Protein Sources Table")
-            if filtered_data.empty:
-                st.warning("No protein sources match the selected filters. Please adjust your selections.")
-            else:
-                st.dataframe(filtered_data, use_container_width=True, height=250)
-                st.download_button(
-                    label="Download Filtered Data as CSV",
-                    data=filtered_data.to_csv(index=False).encode('utf-8'),
-                    file_name='filtered_protein_sources.csv',
-                    mime='text/csv',
-                    help="Download the currently displayed data table."
-                )
-
-            # --- Create and Display Scatter Plot ---
-            st.subheader("Protein Index vs. Cost per gram protein")
-            st.markdown("This chart visualizes the relationship between protein efficiency and cost. Look for items in the top-left quadrant (high protein index, low cost).")
-
-            if filtered_data.empty:
-                st.info("No data to display in the chart. Adjust filters to see results.")
-            else:
-                fig = px.scatter(
-                    filtered_data,
-                    x="Cost per gram protein",
-                    y="Protein Index",
-                    color="Food",
-                    size="Protein Index",
-                    hover_name="Food",
-                    title="Protein Index vs. Cost per Gram Protein by Food Source",
-                    labels={
-                        "Cost per gram protein": "Cost per Gram of Protein (USD)",
-                        "Protein Index": "Protein Index (Efficiency)"
-                    },
-                    template="plotly_white"
-                )
-                fig.update_layout(
-                    xaxis_title_standoff=10,
-                    yaxis_title_standoff=10,
-                    legend_title="Food Source",
-                    hovermode="closest"
-                )
-                st.plotly_chart(fig, use_container_width=True)
-
-            # --- Datawrapper Embed for Protein Dashboard ---
-            st.subheader("Additional Protein Data Visualization")
-            datawrapper_embed_code = """
-            <div style="min-height:558px" id="datawrapper-vis-vYiZd"><script type="text/javascript" defer src="https://datawrapper.dwcdn.net/vYiZd/embed.js" charset="utf-8" data-target="#datawrapper-vis-vYiZd"></script><noscript><img src="https://datawrapper.dwcdn.net/vYiZd/full.png" alt="" /></noscript></div>
-            """
-            html(datawrapper_embed_code, height=580) # Adjust height as needed for proper display
-            # --- END ADDITION ---
-
-            # --- Dashboard Insights and Summary ---
-            st.subheader("Key Insights")
-            if filtered_data.empty:
-                st.info("No insights available as no data matches the current filters.")
-            else:
-                total_foods = len(data)
-                displayed_foods = len(filtered_data)
-
-                st.markdown(f"**{displayed_foods}** out of **{total_foods}** protein sources are currently displayed based on your filters.")
-                st.markdown(f"**Average Protein Index** of filtered foods: **{filtered_data['Protein Index'].mean():.2f}**")
-                st.markdown(f"**Average Cost per gram protein** of filtered foods: **${filtered_data['Cost per gram protein'].mean():.2f}**")
-
-                most_cost_effective = filtered_data.loc[filtered_data['Cost per gram protein'].idxmin()]
-                st.markdown(f"The most **cost-effective** protein source in the filtered list is **{most_cost_effective['Food']}** (Protein Index: {most_cost_effective['Protein Index']}, Cost: ${most_cost_effective['Cost per gram protein']:.2f}/g protein).")
-
-                highest_protein_index = filtered_data.loc[filtered_data['Protein Index'].idxmax()]
-                st.markdown(f"The protein source with the **highest Protein Index** is **{highest_protein_index['Food']}** (Protein Index: {highest_protein_index['Protein Index']}, Cost: ${highest_protein_index['Cost per gram protein']:.2f}/g protein).")
-
-    elif tab_names[i] == "Global Maps":
-        with tab:
-            st.header("Global Food Security Visualizations")
-            st.markdown("Choose a map below to view different aspects of global food security and relevant initiatives.")
-
-            # Define the HTML embed codes for all static maps
-            map_embed_codes = {
-                "Global Hunger Index Map": """
-                <div style="min-height:800px; width:100%" id="datawrapper-vis-8t7Fk"><script type="text/javascript" defer src="https://datawrapper.dwcdn.net/8t7Fk/embed.js" charset="utf-8" data-target="#datawrapper-vis-8t7Fk"></script><noscript><img src="https://datawrapper.dwcdn.net/8t7Fk/full.png" alt="" /></noscript></div>
-                """,
-                # --- MODIFIED: GFSI World Hunger Data with new embed code and adjusted height ---
-                "GFSI Data": """
-                <div style="min-height:395px" id="datawrapper-vis-CKF5t"><script type="text/javascript" defer src="https://datawrapper.dwcdn.net/CKF5t/embed.js" charset="utf-8" data-target="#datawrapper-vis-CKF5t"></script><noscript><img src="https://datawrapper.dwcdn.net/CKF5t/full.png" alt="" /></noscript></div>
-                """,
-                "Reasons for Food Insecurity": """
-                <div style="min-height:800px; width:100%" id="datawrapper-vis-w7M9B"><script type="text/javascript" defer src="https://datawrapper.dwcdn.net/w7M9B/embed.js" charset="utf-8" data-target="#datawrapper-vis-w7M9B"></script><noscript><img src="https://datawrapper.dwcdn.net/w7M9B/full.png" alt="" /></noscript></div>
-                """
-            }
-            
-            # Get the list of map titles from the dictionary keys
-            map_titles = list(map_embed_codes.keys())
-
-            # Use st.radio for single selection of maps
-            selected_map_title = st.radio(
-                "Select a Map to Display:",
-                options=map_titles,
-                index=0, # Default to the first map (Global Hunger Index Map)
-                key="map_selector"
-            )
+# --- Define the tabs ---
+# Tab name -> renderer. Each renderer takes its tab container and returns early
+# when that tab is hidden (the protein one still draws its sidebar filters).
+tab_renderers = {
+    "Protein Dashboard": render_protein_dashboard,
+    "Global Maps": render_global_maps,
+    **{name: partial(render_data_table, name=name) for name in dynamic_dfs},
+}
+tab_names = list(tab_renderers)
+# Tabs track which one is open, so hidden tabs can skip their work entirely.
+tabs = st.tabs(tab_names, key="active_tab", on_change="rerun")
 
-            # Display the selected map
-            if selected_map_title:
-                st.markdown(f"#### {selected_map_title}")
-                # Retrieve the embed code for the selected map
-                embed_code = map_embed_codes[selected_map_title]
-                
-                # Determine the height and scrolling behavior for the Streamlit component
-                if selected_map_title == "GFSI World Hunger Data":
-                    display_height = 800  # Increased height to ensure full display
-                    do_scrolling = False # Set to False as requested
-                else:
-                    display_height = 800
-                    do_scrolling = True
-                
-                html(embed_code, height=display_height, scrolling=do_scrolling)
-                st.markdown("---")
-            else:
-                st.info("Please select a map to display.")
-
-    elif tab_names[i] in dynamic_dfs:
-        with tab:
-            st.header(f"Data: '{tab_names[i]}'")
-            current_df = dynamic_dfs[tab_names[i]]
-            st.dataframe(current_df, use_container_width=True)
-            st.download_button(
-                label=f"Download {tab_names[i]} as CSV",
-                data=current_df.to_csv(index=False).encode('utf-8'),
-                file_name=f'{tab_names[i].lower().replace(" ", "_")}.csv',
-                mime='text/csv',
-                help=f"Download the data from the '{tab_names[i]}' tab."
-            )
+# --- Content for Each Tab ---
+for name, tab in zip(tab_names, tabs):
+    tab_renderers[name](tab)
 
 # --- About Section (remains at the bottom, outside any specific tab) ---
 st.markdown("---")